@@ -3,14 +3,18 @@ Producer-Consumer Pattern Implementation using queue.Queue
 Demonstrates thread synchronization and concurrent programming using Python's queue module
 Includes comprehensive edge case handling and performance analysis
 """
+import io
 import queue
 import threading
 import time
-from typing import List, Optional
+import traceback
+from typing import List, MutableSequence, Optional, Tuple
+from array import array
 from collections import deque
 from dataclasses import dataclass
-from time import perf_counter
+from time import perf_counter, perf_counter_ns
 from datetime import datetime
+from pathlib import Path
 import os
 
 
@@ -19,34 +23,120 @@ class Statistics:
     """Statistics tracking for producer-consumer pattern"""
     items_produced: int = 0
     items_consumed: int = 0
-    producer_wait_time: float = 0.0
-    consumer_wait_time: float = 0.0
+    producer_wait_ns: int = 0
+    consumer_wait_ns: int = 0
     max_queue_size: int = 0
     start_time: float = 0.0
     end_time: float = 0.0
+    
+    @property
+    def producer_wait_time(self) -> float:
+        """Total producer wait time in milliseconds"""
+        return self.producer_wait_ns / 1_000_000
+    
+    @property
+    def consumer_wait_time(self) -> float:
+        """Total consumer wait time in milliseconds"""
+        return self.consumer_wait_ns / 1_000_000
+
+
+class _BatchQueue(queue.Queue):
+    """
+    queue.Queue of item batches that also counts the items it holds
+    
+    maxsize still bounds the number of batches. The item count is updated under
+    the queue mutex by len(batch), so a partial final batch counts only its items.
+    """
+    
+    def _init(self, maxsize: int) -> None:
+        super()._init(maxsize)
+        self.item_count = 0
+    
+    def _put(self, batch: List[int]) -> None:
+        super()._put(batch)
+        self.item_count += len(batch)
+    
+    def _get(self) -> List[int]:
+        batch = super()._get()
+        self.item_count -= len(batch)
+        return batch
+    
+    def queued_items(self) -> int:
+        """Number of items (not batches) currently queued"""
+        return self.item_count
 
 
 class ProducerConsumer:
-    def __init__(self, capacity: int):
+    def __init__(self, capacity: int, simulate: bool = True, verbose: bool = True,
+                 batch_size: int = 1):
         """
         Initialize Producer-Consumer with a shared queue of specified capacity
         
         Args:
             capacity: Maximum size of the shared queue (must be > 0)
+            simulate: Sleep after each item to simulate production/consumption work.
+                Pass False to measure raw synchronization throughput, e.g.
+                ProducerConsumer(capacity, simulate=False).run(10_000)
+            verbose: Report each produced/consumed item. Inside run() these events
+                and the threads' status lines are buffered in order and printed
+                after the threads have joined; direct producer()/consumer() calls
+                print them immediately.
+            batch_size: Number of items transferred per queue operation
+                (must be > 0 and <= capacity).
+                Batching amortizes the queue lock over batch_size items.
             
         Raises:
-            ValueError: If capacity <= 0
+            ValueError: If capacity <= 0, batch_size <= 0 or batch_size > capacity
         """
         if capacity <= 0:
             raise ValueError("Queue capacity must be greater than 0")
+        if batch_size <= 0:
+            raise ValueError("Batch size must be greater than 0")
+        if batch_size > capacity:
+            raise ValueError("Batch size must not exceed queue capacity")
         
-        self.shared_queue = queue.Queue(maxsize=capacity)
-        self.source_container: List[int] = []
-        self.destination_container: List[int] = []
         self.capacity = capacity
+        self.batch_size = batch_size
+        self._prepare_queue(bounded=True)
+        self.source_container: MutableSequence[int] = []
+        self.destination_container: List[int] = []
         self.lock = threading.Lock()
         self.stats = Statistics()
         self._producer_finished = False
+        self._sim_delay_prod = 0.1 if simulate else 0.0
+        self._sim_delay_cons = 0.15 if simulate else 0.0
+        self._verbose = verbose
+        # Set by run() while its threads are alive: events go to _log instead of stdout.
+        # Unbounded: drained by print_log() right after join(), so no event is dropped
+        self._buffer_output = False
+        self._log: deque = deque()
+    
+    def _prepare_queue(self, bounded: bool) -> None:
+        """
+        Create the shared queue for the next run
+        
+        A bounded queue.Queue applies backpressure to the producer. With batching
+        a _BatchQueue is used; its maxsize is counted in batches of at most
+        batch_size <= capacity items, so at most capacity items are queued, and it
+        tracks the queued item count itself.
+        When every item fits within capacity that backpressure can never engage, so
+        unbatched runs use the cheaper C-level queue.SimpleQueue instead. SimpleQueue
+        has no maxsize, task_done() or join(); the consumer stops after total_items.
+        
+        Args:
+            bounded: Whether the producer may need to block on a full queue
+        """
+        if self.batch_size > 1:
+            maxsize = self.capacity // self.batch_size if bounded else 0
+            self.shared_queue = _BatchQueue(maxsize=maxsize)
+            self._queue_depth = self.shared_queue.queued_items
+        elif bounded:
+            self.shared_queue = queue.Queue(maxsize=self.capacity)
+            # Unlocked read of the underlying deque; qsize() would take the queue mutex
+            self._queue_depth = self.shared_queue.queue.__len__
+        else:
+            self.shared_queue = queue.SimpleQueue()
+            self._queue_depth = self.shared_queue.qsize
     
     def initialize_source(self, item_count: int) -> None:
         """
@@ -61,8 +151,9 @@ class ProducerConsumer:
         if item_count < 0:
             raise ValueError("Item count must be non-negative")
         
-        self.source_container = list(range(1, item_count + 1))
-        print(f"Source container initialized with {item_count} items: {self.source_container}")
+        # Packed 8-byte ints instead of a list of int objects
+        self.source_container = array('q', range(1, item_count + 1))
+        print(f"Source container initialized with {item_count} items: {self.source_container.tolist()}")
     
     def initialize_source_custom(self, items: List[int]) -> None:
         """
@@ -85,38 +176,81 @@ class ProducerConsumer:
         Producer thread that reads from source container and places items into shared queue
         Handles edge cases: empty source, null items, interruptions
         """
+        # Producer-owned statistics are kept in locals and stored once on exit;
+        # run() reads them after join()
+        produced = 0
+        wait_ns = 0
+        max_size = 0
+        depth = 0  # Queue depth in items after the latest put
         try:
             # Edge case: Empty source
             if not self.source_container:
-                print("Producer: Source container is empty. Nothing to produce.")
+                self._emit(("msg", "Producer: Source container is empty. Nothing to produce."))
                 self._producer_finished = True
                 return
             
+            batch: List[int] = []
             for item in self.source_container:
                 # Edge case: Handle None items
                 if item is None:
-                    print("Producer: Warning - None item detected, skipping...")
+                    self._emit(("msg", "Producer: Warning - None item detected, skipping..."))
                     continue
                 
-                wait_start = perf_counter()
-                # Queue.put() will block if queue is full
-                self.shared_queue.put(item)
-                wait_end = perf_counter()
-                self.stats.producer_wait_time += (wait_end - wait_start) * 1000  # Convert to ms
+                if self.batch_size == 1:
+                    waited, depth = self._put(item)
+                    wait_ns += waited
+                    if depth > max_size:
+                        max_size = depth
+                else:
+                    batch.append(item)
+                    if len(batch) == self.batch_size:
+                        waited, depth = self._put(batch)
+                        wait_ns += waited
+                        if depth > max_size:
+                            max_size = depth
+                        batch = []
                 
-                current_size = self.shared_queue.qsize()
-                self.stats.max_queue_size = max(self.stats.max_queue_size, current_size)
-                
-                self.stats.items_produced += 1
-                print(f"Producer produced: {item} | Queue size: {current_size}")
-                time.sleep(0.1)  # Simulate production time
+                produced += 1
+                if self._verbose:
+                    self._emit(("prod", item, depth))
+                if self._sim_delay_prod:
+                    time.sleep(self._sim_delay_prod)  # Simulate production time
+            
+            # Ship the final partial batch
+            if batch:
+                waited, depth = self._put(batch)
+                wait_ns += waited
+                if depth > max_size:
+                    max_size = depth
             
             self._producer_finished = True
-            print("Producer finished producing all items")
+            self._emit(("msg", "Producer finished producing all items"))
         except Exception as e:
             print(f"Producer error: {e}")
-            import traceback
             traceback.print_exc()
+        finally:
+            stats = self.stats
+            stats.items_produced += produced
+            stats.producer_wait_ns += wait_ns
+            stats.max_queue_size = max(stats.max_queue_size, max_size)
+    
+    def _put(self, payload) -> Tuple[int, int]:
+        """
+        Place one item or batch into the shared queue
+        
+        Args:
+            payload: A single item, or a list of items when batch_size > 1
+            
+        Returns:
+            Tuple of (nanoseconds spent in put, queue depth in items afterwards)
+        """
+        wait_start = perf_counter_ns()
+        # Queue.put() will block if queue is full
+        self.shared_queue.put(payload)
+        waited = perf_counter_ns() - wait_start
+        
+        # Depth in items, including a partial final batch
+        return waited, self._queue_depth()
     
     def consumer(self, total_items: int) -> None:
         """
@@ -126,47 +260,53 @@ class ProducerConsumer:
         Args:
             total_items: Total number of items to consume (must be >= 0)
         """
+        # Consumer-owned statistics are kept in locals and stored once on exit
+        consumed = 0
+        wait_ns = 0
         try:
             # Edge case: No items to consume
             if total_items < 0:
                 raise ValueError("Total items must be non-negative")
             
             if total_items == 0:
-                print("Consumer: No items to consume.")
+                self._emit(("msg", "Consumer: No items to consume."))
                 return
             
-            consumed = 0
             while consumed < total_items:
-                wait_start = perf_counter()
+                wait_start = perf_counter_ns()
                 # Queue.get() will block if queue is empty
-                item = self.shared_queue.get()
-                wait_end = perf_counter()
-                self.stats.consumer_wait_time += (wait_end - wait_start) * 1000  # Convert to ms
-                
-                # Edge case: Handle None items
-                if item is None:
-                    print("Consumer: Warning - None item received, skipping...")
-                    self.shared_queue.task_done()
-                    continue
+                payload = self.shared_queue.get()
+                wait_ns += perf_counter_ns() - wait_start
                 
-                with self.lock:
+                for item in (payload if self.batch_size > 1 else (payload,)):
+                    # Edge case: Handle None items
+                    if item is None:
+                        self._emit(("msg", "Consumer: Warning - None item received, skipping..."))
+                        continue
+                    
+                    # Sole writer: list.append is atomic under the GIL, so no lock is
+                    # needed here (self.lock only orders readers against reset_statistics())
                     self.destination_container.append(item)
+                    
+                    consumed += 1
+                    
+                    if self._verbose:
+                        self._emit(("cons", item, self._queue_depth(), consumed))
+                    
+                    if self._sim_delay_cons:
+                        time.sleep(self._sim_delay_cons)  # Simulate consumption time
                 
-                consumed += 1
-                self.stats.items_consumed += 1
-                
-                current_size = self.shared_queue.qsize()
-                print(f"Consumer consumed: {item} | Queue size: {current_size} | Total consumed: {consumed}")
-                
-                # Mark task as done
-                self.shared_queue.task_done()
-                time.sleep(0.15)  # Simulate consumption time
+                # Mark task as done (SimpleQueue does not track tasks)
+                if not isinstance(self.shared_queue, queue.SimpleQueue):
+                    self.shared_queue.task_done()
             
-            print("Consumer finished consuming all items")
+            self._emit(("msg", "Consumer finished consuming all items"))
         except Exception as e:
             print(f"Consumer error: {e}")
-            import traceback
             traceback.print_exc()
+        finally:
+            self.stats.items_consumed += consumed
+            self.stats.consumer_wait_ns += wait_ns
     
     def get_destination_container(self) -> List[int]:
         """
@@ -175,6 +315,8 @@ class ProducerConsumer:
         Returns:
             Copy of destination container
         """
+        # The lock orders the copy against reset_statistics() clearing the list;
+        # the consumer appends without it, relying on list.copy() being atomic
         with self.lock:
             return self.destination_container.copy()
     
@@ -185,86 +327,88 @@ class ProducerConsumer:
         Returns:
             Copy of source container
         """
-        return self.source_container.copy()
+        return list(self.source_container)
     
     def perform_analysis(self) -> None:
         """
         Perform analysis and print results to console and file
         """
         separator = "=" * 60
-        report = []
-        
-        report.append("\n" + separator)
-        report.append("PERFORMANCE ANALYSIS RESULTS")
-        report.append("Implementation: ProducerConsumer (Queue)")
-        report.append(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append(separator)
-        
-        # Basic Statistics
-        report.append("\n--- Basic Statistics ---")
-        report.append(f"Queue Capacity: {self.capacity}")
-        report.append(f"Items Produced: {self.stats.items_produced}")
-        report.append(f"Items Consumed: {self.stats.items_consumed}")
-        report.append(f"Source Container Size: {len(self.source_container)}")
-        report.append(f"Destination Container Size: {len(self.destination_container)}")
-        report.append(f"Max Queue Size Reached: {self.stats.max_queue_size}")
-        
-        # Timing Analysis
-        report.append("\n--- Timing Analysis ---")
-        if self.stats.start_time > 0 and self.stats.end_time > 0:
-            total_time = (self.stats.end_time - self.stats.start_time) * 1000  # Convert to ms
-            report.append(f"Total Execution Time: {total_time:.2f} ms")
-            if self.stats.items_consumed > 0:
-                report.append(f"Average Time per Item: {total_time / self.stats.items_consumed:.2f} ms")
-        
-        report.append(f"Total Producer Wait Time: {self.stats.producer_wait_time:.2f} ms")
-        report.append(f"Total Consumer Wait Time: {self.stats.consumer_wait_time:.2f} ms")
-        
-        if self.stats.items_produced > 0:
-            avg_prod_wait = self.stats.producer_wait_time / self.stats.items_produced
-            report.append(f"Average Producer Wait per Item: {avg_prod_wait:.2f} ms")
-        
-        if self.stats.items_consumed > 0:
-            avg_cons_wait = self.stats.consumer_wait_time / self.stats.items_consumed
-            report.append(f"Average Consumer Wait per Item: {avg_cons_wait:.2f} ms")
-        
-        # Queue Utilization
-        report.append("\n--- Queue Utilization ---")
-        utilization_rate = (self.stats.max_queue_size / self.capacity) * 100 if self.capacity > 0 else 0
-        report.append(f"Queue Utilization Rate: {utilization_rate:.2f}%")
-        
+        stats = self.stats
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        # Derived values, computed up front so each section is a single write
+        total_time = None
+        if stats.start_time > 0 and stats.end_time > 0:
+            total_time = (stats.end_time - stats.start_time) * 1000  # Convert to ms
+        # Wait times are accumulated as integer nanoseconds; convert to ms once here
+        producer_wait_ms = stats.producer_wait_time
+        consumer_wait_ms = stats.consumer_wait_time
+        utilization_rate = (stats.max_queue_size / self.capacity) * 100 if self.capacity > 0 else 0
         if utilization_rate > 80:
             efficiency = "High"
         elif utilization_rate > 50:
             efficiency = "Medium"
         else:
             efficiency = "Low"
-        report.append(f"Queue Efficiency: {efficiency}")
-        
-        # Data Integrity
-        report.append("\n--- Data Integrity Analysis ---")
-        data_match = self.source_container == self.get_destination_container()
+        data_match = self.get_source_container() == self.get_destination_container()
         count_match = len(self.source_container) == len(self.destination_container)
-        no_data_loss = self.stats.items_produced == self.stats.items_consumed
-        
-        report.append(f"Data Match: {'✓ PASS' if data_match else '✗ FAIL'}")
-        report.append(f"Count Match: {'✓ PASS' if count_match else '✗ FAIL'}")
-        report.append(f"No Data Loss: {'✓ PASS' if no_data_loss else '✗ FAIL'}")
-        
-        # Thread Synchronization Analysis
-        report.append("\n--- Thread Synchronization Analysis ---")
-        balance_diff = abs(self.stats.items_produced - self.stats.items_consumed)
-        is_balanced = balance_diff <= 1
-        report.append(f"Producer-Consumer Balance: {'✓ Balanced' if is_balanced else '⚠ Imbalanced'}")
-        
-        has_blocking = self.stats.producer_wait_time > 0 or self.stats.consumer_wait_time > 0
-        blocking_status = "✓ Working (threads blocked when needed)" if has_blocking else "⚠ No blocking detected"
-        report.append(f"Blocking Behavior: {blocking_status}")
-        
-        report.append("\n" + separator + "\n")
+        no_data_loss = stats.items_produced == stats.items_consumed
+        is_balanced = abs(stats.items_produced - stats.items_consumed) <= 1
+        has_blocking = stats.producer_wait_ns > 0 or stats.consumer_wait_ns > 0
+        
+        buf = io.StringIO()
+        w = buf.write
+        
+        # Header and Basic Statistics
+        w(f"""
+{separator}
+PERFORMANCE ANALYSIS RESULTS
+Implementation: ProducerConsumer (Queue)
+Timestamp: {timestamp}
+{separator}
+
+--- Basic Statistics ---
+Queue Capacity: {self.capacity}
+Items Produced: {stats.items_produced}
+Items Consumed: {stats.items_consumed}
+Source Container Size: {len(self.source_container)}
+Destination Container Size: {len(self.destination_container)}
+Max Queue Size Reached: {stats.max_queue_size}
+
+--- Timing Analysis ---
+""")
+        if total_time is not None:
+            w(f"Total Execution Time: {total_time:.2f} ms\n")
+            if stats.items_consumed > 0:
+                w(f"Average Time per Item: {total_time / stats.items_consumed:.2f} ms\n")
+        w(f"Total Producer Wait Time: {producer_wait_ms:.2f} ms\n"
+          f"Total Consumer Wait Time: {consumer_wait_ms:.2f} ms\n")
+        if stats.items_produced > 0:
+            w(f"Average Producer Wait per Item: {producer_wait_ms / stats.items_produced:.2f} ms\n")
+        if stats.items_consumed > 0:
+            w(f"Average Consumer Wait per Item: {consumer_wait_ms / stats.items_consumed:.2f} ms\n")
+        
+        # Queue Utilization, Data Integrity and Thread Synchronization
+        w(f"""
+--- Queue Utilization ---
+Queue Utilization Rate: {utilization_rate:.2f}%
+Queue Efficiency: {efficiency}
+
+--- Data Integrity Analysis ---
+Data Match: {'✓ PASS' if data_match else '✗ FAIL'}
+Count Match: {'✓ PASS' if count_match else '✗ FAIL'}
+No Data Loss: {'✓ PASS' if no_data_loss else '✗ FAIL'}
+
+--- Thread Synchronization Analysis ---
+Producer-Consumer Balance: {'✓ Balanced' if is_balanced else '⚠ Imbalanced'}
+Blocking Behavior: {'✓ Working (threads blocked when needed)' if has_blocking else '⚠ No blocking detected'}
+
+{separator}
+""")
         
         # Print to console
-        report_text = "\n".join(report)
+        report_text = buf.getvalue()
         print(report_text)
         
         # Write to file
@@ -272,28 +416,53 @@ class ProducerConsumer:
             # Ensure results directory exists
             os.makedirs("results", exist_ok=True)
             file_path = "results/producer_consumer_results.txt"
-            with open(file_path, "a", encoding="utf-8") as f:
+            # One buffered write of the whole report
+            with Path(file_path).open("a", encoding="utf-8", buffering=1 << 16) as f:
                 f.write(report_text + "\n")
             print(f"Analysis results saved to: {file_path}")
         except Exception as e:
             print(f"Error writing to file: {e}")
     
+    @staticmethod
+    def _format_event(event: tuple) -> str:
+        """Render a ("prod", item, size), ("cons", item, size, total) or ("msg", text) event"""
+        if event[0] == "prod":
+            return f"Producer produced: {event[1]} | Queue size: {event[2]}"
+        if event[0] == "cons":
+            return f"Consumer consumed: {event[1]} | Queue size: {event[2]} | Total consumed: {event[3]}"
+        return event[1]
+    
+    def _emit(self, event: tuple) -> None:
+        """Buffer an event while run() has threads alive, otherwise print it immediately"""
+        if self._buffer_output:
+            self._log.append(event)
+        else:
+            print(self._format_event(event))
+    
+    def print_log(self) -> None:
+        """Print and clear the events buffered by the producer and consumer, in order"""
+        while self._log:
+            print(self._format_event(self._log.popleft()))
+    
     def reset_statistics(self) -> None:
         """Reset statistics for new run"""
         self.stats = Statistics()
         self._producer_finished = False
+        self._log.clear()
         with self.lock:
             self.destination_container.clear()
     
-    def run(self, item_count: int) -> None:
+    def run(self, item_count: int, analyze: bool = True) -> None:
         """
         Run the producer-consumer pattern demonstration
         
         Args:
             item_count: Number of items to process
+            analyze: Print the performance analysis and append it to the results file
         """
         self.initialize_source(item_count)
         self.reset_statistics()
+        self._prepare_queue(bounded=item_count > self.capacity)
         
         # Create threads
         producer_thread = threading.Thread(target=self.producer, name="Producer-Thread")
@@ -304,28 +473,37 @@ class ProducerConsumer:
         print(f"Total items to process: {item_count}")
         print("-" * 60)
         
-        self.stats.start_time = perf_counter()
-        producer_thread.start()
-        consumer_thread.start()
-        
-        # Wait for threads to complete
-        producer_thread.join()
-        consumer_thread.join()
-        self.stats.end_time = perf_counter()
-        
+        self._buffer_output = True
+        try:
+            self.stats.start_time = perf_counter()
+            producer_thread.start()
+            consumer_thread.start()
+            
+            # Wait for threads to complete
+            producer_thread.join()
+            consumer_thread.join()
+            self.stats.end_time = perf_counter()
+        finally:
+            self._buffer_output = False
+        
+        self.print_log()
         print("-" * 60)
         print("All threads completed successfully!")
-        print(f"Source container: {self.source_container}")
-        print(f"Destination container: {self.get_destination_container()}")
+        # One snapshot of each container serves both the printout and the check
+        source = self.get_source_container()
+        destination = self.get_destination_container()
+        print(f"Source container: {source}")
+        print(f"Destination container: {destination}")
         
         # Verification
-        if self.source_container == self.get_destination_container():
+        if source == destination:
             print("Verification: SUCCESS - All items transferred correctly!")
         else:
             print("Verification: FAILED - Items mismatch!")
         
         # Perform and print analysis
-        self.perform_analysis()
+        if analyze:
+            self.perform_analysis()
 
 
 if __name__ == "__main__":
@@ -353,4 +531,4 @@ if __name__ == "__main__":
     # Test 3: Large capacity
     print("\n--- Edge Case 3: Large Capacity ---")
     pc4 = ProducerConsumer(100)
-    pc4.run(50)
+    pc4.run(50, analyze=False)
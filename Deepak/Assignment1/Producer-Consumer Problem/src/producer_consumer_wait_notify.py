@@ -3,31 +3,87 @@ Producer-Consumer Pattern Implementation using threading.Condition with Wait/Not
 Demonstrates thread synchronization using Condition variables, wait(), and notify()
 Includes comprehensive edge case handling and performance analysis
 """
+import atexit
+import io
 import threading
 import time
-from typing import List
+import traceback
+from typing import List, MutableSequence, Optional, TextIO
+from array import array
 from dataclasses import dataclass
-from time import perf_counter
+from time import perf_counter, perf_counter_ns
 from datetime import datetime
 import os
 
 
+RESULTS_FILE_PATH = "results/producer_consumer_wait_notify_results.txt"
+_results_file: Optional[TextIO] = None
+
+
+def _close_results_file() -> None:
+    """Close the shared results file handle, if one is open"""
+    global _results_file
+    if _results_file is not None:
+        _results_file.close()
+        _results_file = None
+
+
+atexit.register(_close_results_file)
+
+
+def _get_results_file() -> TextIO:
+    """
+    Return an append-mode handle to RESULTS_FILE_PATH, resolved against the current directory
+    
+    The handle is kept open between calls and reopened when the working directory
+    has changed or the file has been removed or replaced since it was opened.
+    
+    Returns:
+        Shared append-mode handle, closed automatically at interpreter exit
+    """
+    global _results_file
+    path = os.path.abspath(RESULTS_FILE_PATH)
+    if _results_file is not None:
+        try:
+            current = (_results_file.name == path and
+                       os.path.samestat(os.fstat(_results_file.fileno()), os.stat(path)))
+        except OSError:
+            current = False  # Removed since it was opened
+        if not current:
+            _close_results_file()
+    if _results_file is None:
+        # Ensure results directory exists
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _results_file = open(path, "a", encoding="utf-8", buffering=1 << 16)
+    return _results_file
+
+
 @dataclass
 class Statistics:
     """Statistics tracking for producer-consumer pattern"""
     items_produced: int = 0
     items_consumed: int = 0
-    producer_wait_time: float = 0.0
-    consumer_wait_time: float = 0.0
+    producer_wait_ns: int = 0
+    consumer_wait_ns: int = 0
     max_queue_size: int = 0
     start_time: float = 0.0
     end_time: float = 0.0
+    
+    @property
+    def producer_wait_time(self) -> float:
+        """Total producer wait time in milliseconds"""
+        return self.producer_wait_ns / 1_000_000
+    
+    @property
+    def consumer_wait_time(self) -> float:
+        """Total consumer wait time in milliseconds"""
+        return self.consumer_wait_ns / 1_000_000
 
 
 class ProducerConsumerWaitNotify:
     def __init__(self, capacity: int):
         """
-        Initialize Producer-Consumer with a shared list and condition variable
+        Initialize Producer-Consumer with a shared ring buffer and condition variable
         
         Args:
             capacity: Maximum size of the shared queue (must be > 0)
@@ -38,10 +94,17 @@ class ProducerConsumerWaitNotify:
         if capacity <= 0:
             raise ValueError("Queue capacity must be greater than 0")
         
-        self.shared_queue: List[int] = []
-        self.source_container: List[int] = []
-        self.destination_container: List[int] = []
         self.capacity = capacity
+        # Preallocated ring buffer; its size is rounded up to a power of two so
+        # slot indices can be masked instead of taken modulo capacity
+        buffer_size = 1 << (capacity - 1).bit_length()
+        self._mask = buffer_size - 1
+        self.shared_queue: List[Optional[int]] = [None] * buffer_size
+        self._head = 0  # Total items removed (consumer side)
+        self._tail = 0  # Total items added (producer side)
+        # Packed 8-byte int containers; compared and copied without per-item objects
+        self.source_container: MutableSequence[int] = array('q')
+        self.destination_container: MutableSequence[int] = array('q')
         self.condition = threading.Condition()
         self.dest_lock = threading.Lock()
         self.producer_finished = False
@@ -60,8 +123,8 @@ class ProducerConsumerWaitNotify:
         if item_count < 0:
             raise ValueError("Item count must be non-negative")
         
-        self.source_container = list(range(1, item_count + 1))
-        print(f"Source container initialized with {item_count} items: {self.source_container}")
+        self.source_container = array('q', range(1, item_count + 1))
+        print(f"Source container initialized with {item_count} items: {self.source_container.tolist()}")
     
     def producer(self) -> None:
         """
@@ -69,6 +132,11 @@ class ProducerConsumerWaitNotify:
         Uses Condition.wait() and Condition.notify() for synchronization
         Handles edge cases: empty source, null items, interruptions
         """
+        # Producer-owned statistics are kept in locals and stored once on exit;
+        # the consumer never writes them and run() reads them after join()
+        produced = 0
+        wait_ns = 0
+        max_size = 0
         try:
             # Edge case: Empty source
             if not self.source_container:
@@ -84,25 +152,32 @@ class ProducerConsumerWaitNotify:
                     print("Producer: Warning - None item detected, skipping...")
                     continue
                 
+                wait_start = wait_end = 0
                 with self.condition:
-                    wait_start = perf_counter()
-                    # Wait if queue is full
-                    while len(self.shared_queue) == self.capacity:
-                        print("Queue is full. Producer waiting...")
-                        self.condition.wait()
-                    wait_end = perf_counter()
-                    self.stats.producer_wait_time += (wait_end - wait_start) * 1000  # Convert to ms
+                    # Wait if queue is full; only time the wait when it actually happens
+                    if self._tail - self._head == self.capacity:
+                        wait_start = perf_counter_ns()
+                        while self._tail - self._head == self.capacity:
+                            print("Queue is full. Producer waiting...")
+                            self.condition.wait()
+                        wait_end = perf_counter_ns()
                     
                     # Add item to queue
-                    self.shared_queue.append(item)
-                    current_size = len(self.shared_queue)
-                    self.stats.max_queue_size = max(self.stats.max_queue_size, current_size)
-                    self.stats.items_produced += 1
-                    
-                    print(f"Producer produced: {item} | Queue size: {current_size}")
+                    self.shared_queue[self._tail & self._mask] = item
+                    self._tail += 1
+                    current_size = self._tail - self._head
                     
-                    # Notify consumer that item is available
-                    self.condition.notify()
+                    # Notify consumer only when the queue just became non-empty;
+                    # the consumer never waits while items are available
+                    if current_size == 1:
+                        self.condition.notify()
+                
+                # Statistics are updated outside the condition lock
+                wait_ns += wait_end - wait_start
+                if current_size > max_size:
+                    max_size = current_size
+                produced += 1
+                print(f"Producer produced: {item} | Queue size: {current_size}")
                 
                 time.sleep(0.1)  # Simulate production time
             
@@ -113,8 +188,12 @@ class ProducerConsumerWaitNotify:
             print("Producer finished producing all items")
         except Exception as e:
             print(f"Producer error: {e}")
-            import traceback
             traceback.print_exc()
+        finally:
+            stats = self.stats
+            stats.items_produced += produced
+            stats.producer_wait_ns += wait_ns
+            stats.max_queue_size = max(stats.max_queue_size, max_size)
     
     def consumer(self, total_items: int) -> None:
         """
@@ -125,6 +204,11 @@ class ProducerConsumerWaitNotify:
         Args:
             total_items: Total number of items to consume (must be >= 0)
         """
+        # Items are collected in a consumer-local list and published to
+        # destination_container once, when the consumer exits
+        received: MutableSequence[int] = array('q')
+        consumed = 0
+        wait_ns = 0
         try:
             # Edge case: No items to consume
             if total_items < 0:
@@ -134,48 +218,90 @@ class ProducerConsumerWaitNotify:
                 print("Consumer: No items to consume.")
                 return
             
-            consumed = 0
+            # Sized for every expected item up front; trimmed to consumed on exit
+            received = array('q', [0]) * total_items
             while consumed < total_items:
+                wait_start = wait_end = 0
                 with self.condition:
-                    wait_start = perf_counter()
-                    # Wait if queue is empty and producer is still running
-                    while len(self.shared_queue) == 0 and not self.producer_finished:
-                        print("Queue is empty. Consumer waiting...")
-                        self.condition.wait()
-                    wait_end = perf_counter()
-                    self.stats.consumer_wait_time += (wait_end - wait_start) * 1000  # Convert to ms
-                    
-                    # If queue is empty and producer is finished, break
-                    if len(self.shared_queue) == 0 and self.producer_finished:
-                        break
-                    
-                    # Remove item from queue
-                    item = self.shared_queue.pop(0)
+                    # Wait if queue is empty and producer is still running;
+                    # only time the wait when it actually happens
+                    if self._tail == self._head and not self.producer_finished:
+                        wait_start = perf_counter_ns()
+                        while self._tail == self._head and not self.producer_finished:
+                            print("Queue is empty. Consumer waiting...")
+                            self.condition.wait()
+                        wait_end = perf_counter_ns()
                     
+                    # Take every buffered item in one critical section
+                    batch = []
+                    if self._tail != self._head:
+                        was_full = self._tail - self._head == self.capacity
+                        batch = self._drain()
+                        
+                        # Notify producer only when slots just opened in a full queue;
+                        # the producer never waits while there is free space
+                        if was_full:
+                            self.condition.notify()
+                
+                # Consumer-owned statistic, updated outside the condition lock
+                wait_ns += wait_end - wait_start
+                
+                # If queue is empty and producer is finished, break
+                if not batch:
+                    break
+                
+                # Process the batch outside the condition lock
+                for item in batch:
                     # Edge case: Handle None items
                     if item is None:
                         print("Consumer: Warning - None item received, skipping...")
                         continue
                     
-                    consumed += 1
-                    self.stats.items_consumed += 1
-                    
                     # Add to destination container
-                    with self.dest_lock:
-                        self.destination_container.append(item)
+                    if consumed < total_items:
+                        received[consumed] = item
+                    else:
+                        received.append(item)  # More items than announced
+                    consumed += 1
                     
-                    print(f"Consumer consumed: {item} | Queue size: {len(self.shared_queue)} | Total consumed: {consumed}")
+                    print(f"Consumer consumed: {item} | Queue size: {self._tail - self._head} | Total consumed: {consumed}")
                     
-                    # Notify producer that space is available
-                    self.condition.notify()
-                
-                time.sleep(0.15)  # Simulate consumption time
+                    time.sleep(0.15)  # Simulate consumption time
             
             print("Consumer finished consuming all items")
         except Exception as e:
             print(f"Consumer error: {e}")
-            import traceback
             traceback.print_exc()
+        finally:
+            self.stats.items_consumed += consumed
+            self.stats.consumer_wait_ns += wait_ns
+            del received[consumed:]
+            with self.dest_lock:
+                self.destination_container = received
+    
+    def _drain(self) -> List[Optional[int]]:
+        """
+        Remove and return all items currently in the ring buffer, oldest first
+        Copies at most two contiguous slices; the caller must hold self.condition
+        
+        Returns:
+            List of drained items
+        """
+        count = self._tail - self._head
+        start = self._head & self._mask
+        end = start + count
+        buffer = self.shared_queue
+        if end <= len(buffer):
+            batch = buffer[start:end]
+            buffer[start:end] = [None] * count
+        else:
+            # The occupied region wraps around the end of the buffer
+            end -= len(buffer)
+            batch = buffer[start:] + buffer[:end]
+            buffer[start:] = [None] * (len(buffer) - start)
+            buffer[:end] = [None] * end
+        self._head = self._tail
+        return batch
     
     def get_destination_container(self) -> List[int]:
         """
@@ -185,7 +311,7 @@ class ProducerConsumerWaitNotify:
             Copy of destination container
         """
         with self.dest_lock:
-            return self.destination_container.copy()
+            return self.destination_container.tolist()
     
     def get_source_container(self) -> List[int]:
         """
@@ -194,97 +320,98 @@ class ProducerConsumerWaitNotify:
         Returns:
             Copy of source container
         """
-        return self.source_container.copy()
+        return self.source_container.tolist()
     
     def perform_analysis(self) -> None:
         """
         Perform analysis and print results to console and file
         """
         separator = "=" * 60
-        report = []
-        
-        report.append("\n" + separator)
-        report.append("PERFORMANCE ANALYSIS RESULTS")
-        report.append("Implementation: ProducerConsumerWaitNotify (Wait/Notify)")
-        report.append(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append(separator)
-        
-        # Basic Statistics
-        report.append("\n--- Basic Statistics ---")
-        report.append(f"Queue Capacity: {self.capacity}")
-        report.append(f"Items Produced: {self.stats.items_produced}")
-        report.append(f"Items Consumed: {self.stats.items_consumed}")
-        report.append(f"Source Container Size: {len(self.source_container)}")
-        report.append(f"Destination Container Size: {len(self.destination_container)}")
-        report.append(f"Max Queue Size Reached: {self.stats.max_queue_size}")
-        
-        # Timing Analysis
-        report.append("\n--- Timing Analysis ---")
-        if self.stats.start_time > 0 and self.stats.end_time > 0:
-            total_time = (self.stats.end_time - self.stats.start_time) * 1000  # Convert to ms
-            report.append(f"Total Execution Time: {total_time:.2f} ms")
-            if self.stats.items_consumed > 0:
-                report.append(f"Average Time per Item: {total_time / self.stats.items_consumed:.2f} ms")
-        
-        report.append(f"Total Producer Wait Time: {self.stats.producer_wait_time:.2f} ms")
-        report.append(f"Total Consumer Wait Time: {self.stats.consumer_wait_time:.2f} ms")
-        
-        if self.stats.items_produced > 0:
-            avg_prod_wait = self.stats.producer_wait_time / self.stats.items_produced
-            report.append(f"Average Producer Wait per Item: {avg_prod_wait:.2f} ms")
-        
-        if self.stats.items_consumed > 0:
-            avg_cons_wait = self.stats.consumer_wait_time / self.stats.items_consumed
-            report.append(f"Average Consumer Wait per Item: {avg_cons_wait:.2f} ms")
-        
-        # Queue Utilization
-        report.append("\n--- Queue Utilization ---")
-        utilization_rate = (self.stats.max_queue_size / self.capacity) * 100 if self.capacity > 0 else 0
-        report.append(f"Queue Utilization Rate: {utilization_rate:.2f}%")
+        stats = self.stats
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
+        # Derived values, computed up front so each section is a single write
+        total_time = None
+        if stats.start_time > 0 and stats.end_time > 0:
+            total_time = (stats.end_time - stats.start_time) * 1000  # Convert to ms
+        # Wait times are accumulated as integer nanoseconds; convert to ms once here
+        producer_wait_ms = stats.producer_wait_time
+        consumer_wait_ms = stats.consumer_wait_time
+        utilization_rate = (stats.max_queue_size / self.capacity) * 100 if self.capacity > 0 else 0
         if utilization_rate > 80:
             efficiency = "High"
         elif utilization_rate > 50:
             efficiency = "Medium"
         else:
             efficiency = "Low"
-        report.append(f"Queue Efficiency: {efficiency}")
-        
-        # Data Integrity
-        report.append("\n--- Data Integrity Analysis ---")
-        data_match = self.source_container == self.get_destination_container()
+        # Array-to-array comparison; the published destination is never mutated
+        data_match = self.source_container == self.destination_container
         count_match = len(self.source_container) == len(self.destination_container)
-        no_data_loss = self.stats.items_produced == self.stats.items_consumed
-        
-        report.append(f"Data Match: {'✓ PASS' if data_match else '✗ FAIL'}")
-        report.append(f"Count Match: {'✓ PASS' if count_match else '✗ FAIL'}")
-        report.append(f"No Data Loss: {'✓ PASS' if no_data_loss else '✗ FAIL'}")
+        no_data_loss = stats.items_produced == stats.items_consumed
+        is_balanced = abs(stats.items_produced - stats.items_consumed) <= 1
+        has_blocking = stats.producer_wait_ns > 0 or stats.consumer_wait_ns > 0
         
-        # Thread Synchronization Analysis
-        report.append("\n--- Thread Synchronization Analysis ---")
-        balance_diff = abs(self.stats.items_produced - self.stats.items_consumed)
-        is_balanced = balance_diff <= 1
-        report.append(f"Producer-Consumer Balance: {'✓ Balanced' if is_balanced else '⚠ Imbalanced'}")
-        report.append("Wait/Notify Mechanism: ✓ Working (explicit synchronization)")
+        buf = io.StringIO()
+        w = buf.write
         
-        has_blocking = self.stats.producer_wait_time > 0 or self.stats.consumer_wait_time > 0
-        blocking_status = "✓ Working (threads blocked when needed)" if has_blocking else "⚠ No blocking detected"
-        report.append(f"Blocking Behavior: {blocking_status}")
+        # Header and Basic Statistics
+        w(f"""
+{separator}
+PERFORMANCE ANALYSIS RESULTS
+Implementation: ProducerConsumerWaitNotify (Wait/Notify)
+Timestamp: {timestamp}
+{separator}
+
+--- Basic Statistics ---
+Queue Capacity: {self.capacity}
+Items Produced: {stats.items_produced}
+Items Consumed: {stats.items_consumed}
+Source Container Size: {len(self.source_container)}
+Destination Container Size: {len(self.destination_container)}
+Max Queue Size Reached: {stats.max_queue_size}
+
+--- Timing Analysis ---
+""")
+        if total_time is not None:
+            w(f"Total Execution Time: {total_time:.2f} ms\n")
+            if stats.items_consumed > 0:
+                w(f"Average Time per Item: {total_time / stats.items_consumed:.2f} ms\n")
+        w(f"Total Producer Wait Time: {producer_wait_ms:.2f} ms\n"
+          f"Total Consumer Wait Time: {consumer_wait_ms:.2f} ms\n")
+        if stats.items_produced > 0:
+            w(f"Average Producer Wait per Item: {producer_wait_ms / stats.items_produced:.2f} ms\n")
+        if stats.items_consumed > 0:
+            w(f"Average Consumer Wait per Item: {consumer_wait_ms / stats.items_consumed:.2f} ms\n")
         
-        report.append("\n" + separator + "\n")
+        # Queue Utilization, Data Integrity and Thread Synchronization
+        w(f"""
+--- Queue Utilization ---
+Queue Utilization Rate: {utilization_rate:.2f}%
+Queue Efficiency: {efficiency}
+
+--- Data Integrity Analysis ---
+Data Match: {'✓ PASS' if data_match else '✗ FAIL'}
+Count Match: {'✓ PASS' if count_match else '✗ FAIL'}
+No Data Loss: {'✓ PASS' if no_data_loss else '✗ FAIL'}
+
+--- Thread Synchronization Analysis ---
+Producer-Consumer Balance: {'✓ Balanced' if is_balanced else '⚠ Imbalanced'}
+Wait/Notify Mechanism: ✓ Working (explicit synchronization)
+Blocking Behavior: {'✓ Working (threads blocked when needed)' if has_blocking else '⚠ No blocking detected'}
+
+{separator}
+""")
         
         # Print to console
-        report_text = "\n".join(report)
+        report_text = buf.getvalue()
         print(report_text)
         
         # Write to file
         try:
-            # Ensure results directory exists
-            os.makedirs("results", exist_ok=True)
-            file_path = "results/producer_consumer_wait_notify_results.txt"
-            with open(file_path, "a", encoding="utf-8") as f:
-                f.write(report_text + "\n")
-            print(f"Analysis results saved to: {file_path}")
+            results_file = _get_results_file()
+            results_file.write(report_text + "\n")
+            results_file.flush()
+            print(f"Analysis results saved to: {RESULTS_FILE_PATH}")
         except Exception as e:
             print(f"Error writing to file: {e}")
     
@@ -292,8 +419,12 @@ class ProducerConsumerWaitNotify:
         """Reset statistics for new run"""
         self.stats = Statistics()
         self.producer_finished = False
+        with self.condition:
+            self.shared_queue[:] = [None] * len(self.shared_queue)
+            self._head = self._tail = 0
         with self.dest_lock:
-            self.destination_container.clear()
+            # Replaced rather than cleared, so a published destination stays immutable
+            self.destination_container = array('q')
     
     def run(self, item_count: int) -> None:
         """
@@ -325,11 +456,13 @@ class ProducerConsumerWaitNotify:
         
         print("-" * 60)
         print("All threads completed successfully!")
-        print(f"Source container: {self.source_container}")
-        print(f"Destination container: {self.get_destination_container()}")
+        # The consumer has handed off its array and will not touch it again
+        destination = self.destination_container
+        print(f"Source container: {self.source_container.tolist()}")
+        print(f"Destination container: {destination.tolist()}")
         
         # Verification
-        if self.source_container == self.get_destination_container():
+        if self.source_container == destination:
             print("Verification: SUCCESS - All items transferred correctly!")
         else:
             print("Verification: FAILED - Items mismatch!")
@@ -2,7 +2,10 @@
 Comprehensive Unit Tests for ProducerConsumer
 Tests all functionality including edge cases
 """
+import contextlib
+import io
 import unittest
+import queue
 import threading
 import time
 import sys
@@ -121,6 +124,15 @@ class TestProducerConsumer(unittest.TestCase):
         
         self.assertEqual(source, dest)
     
+    def test_queue_selection(self):
+        """Test that a SimpleQueue is used only when all items fit in capacity"""
+        self.pc.run(5)
+        self.assertIsInstance(self.pc.shared_queue, queue.SimpleQueue)
+        
+        self.pc.run(6)
+        self.assertIsInstance(self.pc.shared_queue, queue.Queue)
+        self.assertEqual(self.pc.get_source_container(), self.pc.get_destination_container())
+    
     def test_data_integrity(self):
         """Test data integrity - no data loss"""
         item_count = 50
@@ -209,6 +221,96 @@ class TestProducerConsumer(unittest.TestCase):
         except Exception as e:
             self.fail(f"perform_analysis() raised {type(e).__name__} unexpectedly: {e}")
     
+    def test_without_simulated_work(self):
+        """Test that disabling simulated work keeps data intact and runs fast"""
+        fast_pc = ProducerConsumer(5, simulate=False)
+        start_time = time.perf_counter()
+        fast_pc.run(1000)
+        execution_time = (time.perf_counter() - start_time) * 1000  # Convert to ms
+        
+        self.assertEqual(fast_pc.get_source_container(), fast_pc.get_destination_container())
+        self.assertEqual(fast_pc.stats.items_consumed, 1000)
+        self.assertLess(execution_time, 10000, "Execution without simulated work should be fast")
+    
+    def test_verbose_log_keeps_every_event(self):
+        """Test that every per-item event is printed, however many items there are"""
+        verbose_pc = ProducerConsumer(5, simulate=False)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            verbose_pc.run(12000, analyze=False)
+        
+        text = output.getvalue()
+        self.assertEqual(text.count("Producer produced:"), 12000)
+        self.assertEqual(text.count("Consumer consumed:"), 12000)
+    
+    def test_verbose_status_lines_keep_their_order(self):
+        """Test that the threads' finished lines are printed after their item events"""
+        ordered_pc = ProducerConsumer(2, simulate=False)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            ordered_pc.run(4, analyze=False)
+        
+        lines = output.getvalue().splitlines()
+        producer_lines = [i for i, line in enumerate(lines) if line.startswith("Producer produced:")]
+        consumer_lines = [i for i, line in enumerate(lines) if line.startswith("Consumer consumed:")]
+        self.assertGreater(lines.index("Producer finished producing all items"), max(producer_lines))
+        self.assertGreater(lines.index("Consumer finished consuming all items"), max(consumer_lines))
+    
+    def test_direct_calls_print_immediately(self):
+        """Test that producer()/consumer() called outside run() print instead of buffering"""
+        direct_pc = ProducerConsumer(5, simulate=False)
+        direct_pc.initialize_source_custom([1, None, 3])
+        direct_pc.reset_statistics()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            direct_pc.producer()
+            direct_pc.consumer(2)
+        
+        text = output.getvalue()
+        self.assertEqual(len(direct_pc._log), 0)
+        self.assertIn("Producer: Warning - None item detected, skipping...", text)
+        self.assertEqual(text.count("Producer produced:"), 2)
+        self.assertEqual(text.count("Consumer consumed:"), 2)
+        self.assertEqual(direct_pc.get_destination_container(), [1, 3])
+    
+    def test_batched_transfer(self):
+        """Test that batched transfer preserves order, including a partial final batch"""
+        batch_pc = ProducerConsumer(8, simulate=False, batch_size=4)
+        batch_pc.run(30)
+        
+        self.assertEqual(batch_pc.get_source_container(), batch_pc.get_destination_container())
+        self.assertEqual(batch_pc.stats.items_produced, 30)
+        self.assertEqual(batch_pc.stats.items_consumed, 30)
+        self.assertLessEqual(batch_pc.stats.max_queue_size, 8)
+    
+    def test_constructor_invalid_batch_size(self):
+        """Test constructor with invalid batch size"""
+        with self.assertRaises(ValueError):
+            ProducerConsumer(5, batch_size=0)
+    
+    def test_constructor_batch_size_exceeds_capacity(self):
+        """Test constructor rejects a batch size larger than the queue capacity"""
+        with self.assertRaises(ValueError):
+            ProducerConsumer(5, batch_size=8)
+    
+    def test_batched_transfer_partial_batches(self):
+        """Test that queue depth counts the items of a partial batch, not a full batch"""
+        # All items fit within capacity: the only batch is partial
+        small_pc = ProducerConsumer(5, simulate=False, verbose=False, batch_size=4)
+        small_pc.run(3)
+        self.assertEqual(small_pc.get_source_container(), small_pc.get_destination_container())
+        self.assertLessEqual(small_pc.stats.max_queue_size, 3)
+        
+        # Capacity not a multiple of batch_size, with a partial final batch
+        odd_pc = ProducerConsumer(3, simulate=False, verbose=False, batch_size=2)
+        odd_pc.run(7)
+        self.assertEqual(odd_pc.get_source_container(), odd_pc.get_destination_container())
+        self.assertLessEqual(odd_pc.stats.max_queue_size, 3)
+        
+        three_pc = ProducerConsumer(3, simulate=False, verbose=False, batch_size=2)
+        three_pc.run(3)
+        self.assertLessEqual(three_pc.stats.max_queue_size, 3)
+    
     def test_queue_blocking_behavior(self):
         """Test that queue properly blocks when full/empty"""
         small_pc = ProducerConsumer(2)  # Small capacity to force blocking
@@ -0,0 +1,111 @@
+"""
+Unit Tests for ProducerConsumerWaitNotify
+Tests the ring buffer, wait/notify hand-off and repeated runs
+"""
+import unittest
+from unittest import mock
+import shutil
+import sys
+import os
+import tempfile
+
+# Add parent directory to path to import from src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+import producer_consumer_wait_notify
+from producer_consumer_wait_notify import ProducerConsumerWaitNotify
+
+
+class TestProducerConsumerWaitNotify(unittest.TestCase):
+    
+    def assert_transferred(self, pc, item_count):
+        """Assert that every item arrived in order and the queue never overflowed"""
+        self.assertEqual(len(pc.get_source_container()), item_count)
+        self.assertEqual(pc.get_destination_container(), pc.get_source_container())
+        self.assertEqual(pc.stats.items_produced, item_count)
+        self.assertEqual(pc.stats.items_consumed, item_count)
+        self.assertLessEqual(pc.stats.max_queue_size, pc.capacity)
+    
+    def test_constructor_invalid_capacity(self):
+        """Test constructor with invalid capacity"""
+        with self.assertRaises(ValueError):
+            ProducerConsumerWaitNotify(0)
+        with self.assertRaises(ValueError):
+            ProducerConsumerWaitNotify(-1)
+    
+    def test_capacity_one(self):
+        """Test a single-slot buffer, where every item waits on a full queue"""
+        pc = ProducerConsumerWaitNotify(1)
+        pc.run(5)
+        self.assert_transferred(pc, 5)
+    
+    def test_non_power_of_two_capacity_wraps(self):
+        """Test a capacity below its ring buffer size with items wrapping the buffer"""
+        pc = ProducerConsumerWaitNotify(3)
+        pc.run(20)
+        self.assert_transferred(pc, 20)
+    
+    def test_many_wraps_without_simulated_work(self):
+        """Test many wrap-arounds with the simulated work sleeps disabled"""
+        for capacity in (1, 3, 5):
+            with self.subTest(capacity=capacity):
+                pc = ProducerConsumerWaitNotify(capacity)
+                with mock.patch.object(producer_consumer_wait_notify.time, "sleep"):
+                    pc.run(1000)
+                self.assert_transferred(pc, 1000)
+    
+    def test_run_twice(self):
+        """Test that a second run on the same instance starts from a clean state"""
+        pc = ProducerConsumerWaitNotify(3)
+        pc.run(7)
+        self.assert_transferred(pc, 7)
+        pc.run(4)
+        self.assert_transferred(pc, 4)
+    
+    def test_run_zero_items(self):
+        """Test with empty source"""
+        pc = ProducerConsumerWaitNotify(5)
+        pc.run(0)
+        self.assert_transferred(pc, 0)
+        self.assertEqual(pc.get_destination_container(), [])
+    
+    def test_get_destination_container_returns_copy(self):
+        """Test that the destination copy cannot modify the published container"""
+        pc = ProducerConsumerWaitNotify(2)
+        pc.run(3)
+        dest = pc.get_destination_container()
+        dest.append(99)
+        self.assertEqual(pc.get_destination_container(), [1, 2, 3])
+    
+    def test_results_file_follows_working_directory(self):
+        """Test that perform_analysis() writes under the current directory on every call"""
+        pc = ProducerConsumerWaitNotify(2)
+        pc.run(2)
+        original_dir = os.getcwd()
+        first_dir = tempfile.mkdtemp()
+        second_dir = tempfile.mkdtemp()
+        try:
+            for directory in (first_dir, second_dir, first_dir):
+                os.chdir(directory)
+                pc.perform_analysis()
+            # Removing results/ forces the next call to recreate it
+            shutil.rmtree(os.path.join(first_dir, "results"))
+            pc.perform_analysis()
+        finally:
+            os.chdir(original_dir)
+            producer_consumer_wait_notify._close_results_file()
+        
+        def report_count(directory):
+            with open(os.path.join(directory, producer_consumer_wait_notify.RESULTS_FILE_PATH),
+                      encoding="utf-8") as f:
+                return f.read().count("PERFORMANCE ANALYSIS RESULTS")
+        
+        try:
+            self.assertEqual(report_count(first_dir), 1)
+            self.assertEqual(report_count(second_dir), 1)
+        finally:
+            shutil.rmtree(first_dir)
+            shutil.rmtree(second_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,21 +1,48 @@
 """
-Sales Data Analyzer using Python functional programming.
-Demonstrates functional programming, data aggregation, and lambda expressions.
+Sales Data Analyzer using columnar aggregation over the standard library.
+Records are transposed into packed array columns, string fields are factorized
+into integer codes, and grouped aggregates are memoized per analyzer.
 """
 
-from functools import reduce
-from collections import defaultdict
-from typing import List, Dict, Optional, Tuple
+from functools import wraps
+from collections import Counter
+from typing import Any, Callable, Iterable, List, Dict, NamedTuple, Optional, Sequence, Tuple
+from array import array
+from copy import copy
+import heapq
+import io
+import sys
+from operator import attrgetter, itemgetter
 import csv
-from datetime import datetime
+from datetime import date as _date, datetime
+
+
+def _parse_date(text: str) -> _date:
+    """
+    Parses a date exactly as datetime.strptime(text, "%Y-%m-%d").date() would.
+    
+    Zero-padded YYYY-MM-DD strings take the much cheaper C-level
+    date.fromisoformat; anything else (e.g. "2024-1-5") goes through strptime,
+    which also rejects the other ISO forms newer fromisoformat versions accept.
+    """
+    if len(text) == 10 and text[4] == '-' and text[7] == '-':
+        try:
+            return _date.fromisoformat(text)
+        except ValueError:
+            pass
+    return datetime.strptime(text, "%Y-%m-%d").date()
 
 
 class SalesRecord:
     """Represents a sales record from the CSV file."""
     
+    # Fixed attribute layout: no per-instance __dict__, faster attribute access
+    __slots__ = ('date', 'product', 'category', 'quantity', 'unit_price',
+                 'total_amount', 'region', 'sales_person')
+    
     def __init__(self, date: str, product: str, category: str, quantity: int,
                  unit_price: float, total_amount: float, region: str, sales_person: str):
-        self.date = datetime.strptime(date, "%Y-%m-%d").date()
+        self.date = _parse_date(date)
         self.product = product
         self.category = category
         self.quantity = quantity
@@ -31,6 +58,11 @@ class SalesRecord:
                 f"region='{self.region}', sales_person='{self.sales_person}')")
 
 
+# CSV header names in SalesRecord constructor order
+_CSV_COLUMNS = ('Date', 'Product', 'Category', 'Quantity', 'UnitPrice',
+                'TotalAmount', 'Region', 'SalesPerson')
+
+
 def read_sales_data(file_path: str) -> List[SalesRecord]:
     """
     Reads sales records from a CSV file.
@@ -41,145 +73,353 @@ def read_sales_data(file_path: str) -> List[SalesRecord]:
     Returns:
         List of SalesRecord objects
     """
-    records = []
     with open(file_path, 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header is None:
+            return []
+        # Pick the SalesRecord fields out of each row list by header position
+        fields = itemgetter(*map(header.index, _CSV_COLUMNS))
+        records = []
+        append = records.append
         for row in reader:
-            record = SalesRecord(
-                date=row['Date'],
-                product=row['Product'],
-                category=row['Category'],
-                quantity=int(row['Quantity']),
-                unit_price=float(row['UnitPrice']),
-                total_amount=float(row['TotalAmount']),
-                region=row['Region'],
-                sales_person=row['SalesPerson']
-            )
-            records.append(record)
-    return records
+            if not row:
+                continue  # blank line, skipped as DictReader did
+            date, product, category, quantity, unit_price, total_amount, region, sales_person = fields(row)
+            append(SalesRecord(date, product, category, int(quantity), float(unit_price),
+                               float(total_amount), region, sales_person))
+        return records
+
+
+class SalesReport(NamedTuple):
+    """Every SalesAnalyzer aggregate, as returned by SalesAnalyzer.compute_all()."""
+    total_sales: float
+    average_sales: float
+    max_sales: float
+    min_sales: float
+    total_quantity: int
+    sales_by_category: Dict[str, float]
+    sales_by_region: Dict[str, float]
+    sales_by_sales_person: Dict[str, float]
+    sales_by_product: Dict[str, float]
+    quantity_by_category: Dict[str, int]
+    average_unit_price_by_category: Dict[str, float]
+    transaction_count_by_region: Dict[str, int]
+    unique_products: set
+    top_region: Optional[str]
+    top_sales_person: Optional[str]
+
+
+class _SalesSummary(NamedTuple):
+    """Scalar statistics over the sales amounts, computed together."""
+    total: float
+    count: int
+    minimum: float
+    maximum: float
+
+
+# SalesRecord fields held as analyzer columns, in _build_columns order
+_COLUMN_FIELDS = attrgetter('total_amount', 'quantity', 'unit_price',
+                            'category', 'region', 'sales_person', 'product')
+
+
+class _LevelIndex(dict):
+    """Dictionary that assigns the next integer code to a level on first lookup."""
+    
+    __slots__ = ()
+    
+    def __missing__(self, level: str) -> int:
+        code = self[level] = len(self)
+        return code
+
+
+def _pack(typecode: str, values: Tuple[Any, ...]) -> Sequence[Any]:
+    """
+    Packs a numeric column into an array, keeping the tuple if the typecode rejects it.
+    
+    Args:
+        typecode: array typecode, 'd' for amounts or 'q' for quantities
+        values: Column of numbers
+        
+    Returns:
+        array of the values, or the values unchanged when some cannot be stored
+        (e.g. a fractional quantity), so aggregates match plain Python sums
+    """
+    try:
+        return array(typecode, values)
+    except (TypeError, OverflowError):
+        return values
+
+
+def _factorize(values: Iterable[str]) -> Tuple[array, Tuple[str, ...]]:
+    """
+    Encodes a string column as integer codes plus the distinct levels.
+    
+    Args:
+        values: Column of strings
+        
+    Returns:
+        Tuple of (codes, levels) where levels[codes[i]] is the i-th value;
+        levels are in order of first appearance
+    """
+    index = _LevelIndex()
+    codes = array('l', map(index.__getitem__, values))
+    return codes, tuple(index)
+
+
+def _group_sum(codes: array, levels: Tuple[str, ...], values, start=0.0) -> Dict[str, Any]:
+    """
+    Sums values per group over a factorized column in a single pass.
+    
+    Args:
+        codes: Integer group codes from _factorize
+        levels: Group labels from _factorize
+        values: Column of amounts aligned with codes
+        start: Initial value for each group (0.0 for floats, 0 for ints)
+        
+    Returns:
+        Dictionary mapping each level to the sum of its values
+    """
+    sums = [start] * len(levels)
+    for code, value in zip(codes, values):
+        sums[code] += value
+    return dict(zip(levels, sums))
+
+
+def _group_count(codes: array, levels: Tuple[str, ...]) -> Dict[str, int]:
+    """Counts the rows in each group of a factorized column."""
+    counts = Counter(codes)
+    return {level: counts[code] for code, level in enumerate(levels)}
+
+
+def _memoized(method: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """
+    Caches the result of a no-argument SalesAnalyzer method on the instance.
+    
+    Callers receive a shallow copy so the cached aggregate cannot be mutated.
+    """
+    key = method.__name__
+    
+    @wraps(method)
+    def wrapper(self):
+        if key not in self._cache:
+            self._cache[key] = method(self)
+        return copy(self._cache[key])
+    
+    return wrapper
 
 
 class SalesAnalyzer:
-    """Performs various data analysis operations on sales data using functional programming."""
+    """Performs data analysis operations on sales data over cached, factorized columns."""
     
     def __init__(self, sales_records: List[SalesRecord]):
         self.sales_records = sales_records
+        self._build_columns()
+    
+    def _build_columns(self) -> None:
+        """Builds the columnar view of sales_records and clears cached aggregates."""
+        self._cache: Dict[str, Any] = {}
+        # Column-oriented (struct-of-arrays) copies of the record fields,
+        # transposed from the records in a single pass
+        (totals, quantities, unit_prices,
+         categories, regions, sales_people, products) = (
+            tuple(zip(*map(_COLUMN_FIELDS, self.sales_records))) or ((),) * 7)
+        # Numeric columns are packed arrays so sum/min/max run as single C loops.
+        self._totals = _pack('d', totals)
+        self._quantities = _pack('q', quantities)
+        self._unit_prices = _pack('d', unit_prices)
+        # String columns are factorized once so groupings index small ints
+        self._category_codes, self._category_levels = _factorize(categories)
+        self._region_codes, self._region_levels = _factorize(regions)
+        self._sales_person_codes, self._sales_person_levels = _factorize(sales_people)
+        self._product_codes, self._product_levels = _factorize(products)
+    
+    def invalidate(self) -> None:
+        """Discards cached results; call after modifying sales_records in place."""
+        self._build_columns()
+    
+    @_memoized
+    def _summary(self) -> _SalesSummary:
+        """Computes total, count, minimum and maximum sales in one step."""
+        totals = self._totals
+        if not totals:
+            return _SalesSummary(0.0, 0, 0.0, 0.0)
+        return _SalesSummary(sum(totals, 0.0), len(totals), min(totals), max(totals))
     
     def get_total_sales(self) -> float:
         """Calculates the total sales amount across all records."""
-        return reduce(lambda x, y: x + y, 
-                     map(lambda r: r.total_amount, self.sales_records), 0.0)
+        return self._summary().total
     
     def get_average_sales(self) -> float:
         """Calculates the average sales amount per transaction."""
-        if not self.sales_records:
+        summary = self._summary()
+        if not summary.count:
             return 0.0
-        total = self.get_total_sales()
-        return total / len(self.sales_records)
+        return summary.total / summary.count
     
     def get_max_sales(self) -> float:
         """Finds the maximum sales amount."""
-        if not self.sales_records:
-            return 0.0
-        return max(map(lambda r: r.total_amount, self.sales_records))
+        return self._summary().maximum
     
     def get_min_sales(self) -> float:
         """Finds the minimum sales amount."""
-        if not self.sales_records:
-            return 0.0
-        return min(map(lambda r: r.total_amount, self.sales_records))
+        return self._summary().minimum
     
+    @_memoized
     def get_sales_by_category(self) -> Dict[str, float]:
         """Groups sales by category and calculates total sales per category."""
-        def accumulate_by_category(acc: Dict[str, float], record: SalesRecord) -> Dict[str, float]:
-            acc[record.category] = acc.get(record.category, 0.0) + record.total_amount
-            return acc
-        
-        return reduce(accumulate_by_category, self.sales_records, {})
+        return _group_sum(self._category_codes, self._category_levels, self._totals)
     
+    @_memoized
     def get_sales_by_region(self) -> Dict[str, float]:
         """Groups sales by region and calculates total sales per region."""
-        def accumulate_by_region(acc: Dict[str, float], record: SalesRecord) -> Dict[str, float]:
-            acc[record.region] = acc.get(record.region, 0.0) + record.total_amount
-            return acc
-        
-        return reduce(accumulate_by_region, self.sales_records, {})
+        return _group_sum(self._region_codes, self._region_levels, self._totals)
     
+    @_memoized
     def get_sales_by_sales_person(self) -> Dict[str, float]:
         """Groups sales by sales person and calculates total sales per person."""
-        def accumulate_by_person(acc: Dict[str, float], record: SalesRecord) -> Dict[str, float]:
-            acc[record.sales_person] = acc.get(record.sales_person, 0.0) + record.total_amount
-            return acc
-        
-        return reduce(accumulate_by_person, self.sales_records, {})
+        return _group_sum(self._sales_person_codes, self._sales_person_levels,
+                          self._totals)
+    
+    @_memoized
+    def _get_sales_by_product(self) -> Dict[str, float]:
+        """Groups sales by product and calculates total sales per product."""
+        return _group_sum(self._product_codes, self._product_levels, self._totals)
     
     def get_top_products(self, n: int) -> Dict[str, float]:
         """Finds the top N products by total sales amount."""
-        def accumulate_by_product(acc: Dict[str, float], record: SalesRecord) -> Dict[str, float]:
-            acc[record.product] = acc.get(record.product, 0.0) + record.total_amount
-            return acc
-        
-        product_sales = reduce(accumulate_by_product, self.sales_records, {})
-        sorted_products = sorted(product_sales.items(), key=lambda x: x[1], reverse=True)
-        return dict(sorted_products[:n])
+        product_sales = self._get_sales_by_product()
+        # Partial selection: O(P log n) instead of sorting every product
+        return dict(heapq.nlargest(n, product_sales.items(), key=itemgetter(1)))
     
+    @_memoized
     def get_quantity_by_category(self) -> Dict[str, int]:
         """Calculates total quantity sold by category."""
-        def accumulate_quantity(acc: Dict[str, int], record: SalesRecord) -> Dict[str, int]:
-            acc[record.category] = acc.get(record.category, 0) + record.quantity
-            return acc
-        
-        return reduce(accumulate_quantity, self.sales_records, {})
+        return _group_sum(self._category_codes, self._category_levels,
+                          self._quantities, 0)
     
+    @_memoized
     def get_top_region(self) -> Optional[str]:
         """Finds the region with the highest sales."""
         sales_by_region = self.get_sales_by_region()
         if not sales_by_region:
             return None
-        return max(sales_by_region.items(), key=lambda x: x[1])[0]
+        return max(sales_by_region.items(), key=itemgetter(1))[0]
     
+    @_memoized
     def get_top_sales_person(self) -> Optional[str]:
         """Finds the sales person with the highest sales."""
         sales_by_person = self.get_sales_by_sales_person()
         if not sales_by_person:
             return None
-        return max(sales_by_person.items(), key=lambda x: x[1])[0]
+        return max(sales_by_person.items(), key=itemgetter(1))[0]
     
+    @_memoized
     def get_average_unit_price_by_category(self) -> Dict[str, float]:
         """Calculates average unit price by category."""
-        category_data = defaultdict(lambda: {'total_price': 0.0, 'count': 0})
-        
-        def accumulate_price(acc, record):
-            acc[record.category]['total_price'] += record.unit_price
-            acc[record.category]['count'] += 1
-            return acc
-        
-        result = reduce(accumulate_price, self.sales_records, category_data)
-        return {cat: data['total_price'] / data['count'] 
-                for cat, data in result.items()}
+        price_totals = _group_sum(self._category_codes, self._category_levels,
+                                  self._unit_prices)
+        counts = _group_count(self._category_codes, self._category_levels)
+        return {cat: total_price / counts[cat]
+                for cat, total_price in price_totals.items()}
     
+    @_memoized
     def get_transaction_count_by_region(self) -> Dict[str, int]:
         """Counts the number of transactions per region."""
-        def accumulate_count(acc: Dict[str, int], record: SalesRecord) -> Dict[str, int]:
-            acc[record.region] = acc.get(record.region, 0) + 1
-            return acc
-        
-        return reduce(accumulate_count, self.sales_records, {})
+        return _group_count(self._region_codes, self._region_levels)
+    
+    @_memoized
+    def _get_sales_by_category_lower(self) -> Dict[str, float]:
+        """Category totals keyed by lower-cased name, for case-insensitive lookups."""
+        totals: Dict[str, float] = {}
+        for name, total in self.get_sales_by_category().items():
+            key = name.lower()
+            totals[key] = totals.get(key, 0.0) + total
+        return totals
     
     def get_sales_by_category_filtered(self, category: str) -> float:
         """Filters sales records by category and calculates total."""
-        filtered = filter(lambda r: r.category.lower() == category.lower(), self.sales_records)
-        return reduce(lambda x, y: x + y, 
-                     map(lambda r: r.total_amount, filtered), 0.0)
+        # Single lookup in the cached per-category totals rather than rescanning every record
+        return self._get_sales_by_category_lower().get(category.lower(), 0.0)
     
+    @_memoized
     def get_unique_products(self) -> set:
         """Gets all unique products."""
-        return set(map(lambda r: r.product, self.sales_records))
+        return set(self._product_levels)
     
+    @_memoized
     def get_total_quantity(self) -> int:
         """Calculates total quantity sold across all records."""
-        return reduce(lambda x, y: x + y, 
-                     map(lambda r: r.quantity, self.sales_records), 0)
+        return sum(self._quantities)
+    
+    def _compute_grouped(self) -> None:
+        """
+        Computes every grouped aggregate in one fused pass over the columns.
+        
+        Results are stored in the cache under the names of the methods that
+        would otherwise compute them one column scan at a time.
+        """
+        category_sales = [0.0] * len(self._category_levels)
+        category_quantity = [0] * len(self._category_levels)
+        category_price = [0.0] * len(self._category_levels)
+        category_count = [0] * len(self._category_levels)
+        region_sales = [0.0] * len(self._region_levels)
+        region_count = [0] * len(self._region_levels)
+        person_sales = [0.0] * len(self._sales_person_levels)
+        product_sales = [0.0] * len(self._product_levels)
+        
+        for category, region, person, product, total, quantity, unit_price in zip(
+                self._category_codes, self._region_codes, self._sales_person_codes,
+                self._product_codes, self._totals, self._quantities, self._unit_prices):
+            category_sales[category] += total
+            category_quantity[category] += quantity
+            category_price[category] += unit_price
+            category_count[category] += 1
+            region_sales[region] += total
+            region_count[region] += 1
+            person_sales[person] += total
+            product_sales[product] += total
+        
+        cache = self._cache
+        cache['get_sales_by_category'] = dict(zip(self._category_levels, category_sales))
+        cache['get_quantity_by_category'] = dict(zip(self._category_levels, category_quantity))
+        cache['get_average_unit_price_by_category'] = {
+            cat: total_price / count
+            for cat, total_price, count in zip(self._category_levels, category_price, category_count)}
+        cache['get_sales_by_region'] = dict(zip(self._region_levels, region_sales))
+        cache['get_transaction_count_by_region'] = dict(zip(self._region_levels, region_count))
+        cache['get_sales_by_sales_person'] = dict(zip(self._sales_person_levels, person_sales))
+        cache['_get_sales_by_product'] = dict(zip(self._product_levels, product_sales))
+    
+    def compute_all(self) -> SalesReport:
+        """
+        Computes every aggregate, walking the records once for all groupings.
+        
+        The individual get_* methods read the same cached results afterwards,
+        so calling them after compute_all() does not rescan the records.
+        
+        Returns:
+            SalesReport with all statistics, groupings and top performers
+        """
+        if '_get_sales_by_product' not in self._cache:
+            self._compute_grouped()
+        return SalesReport(
+            total_sales=self.get_total_sales(),
+            average_sales=self.get_average_sales(),
+            max_sales=self.get_max_sales(),
+            min_sales=self.get_min_sales(),
+            total_quantity=self.get_total_quantity(),
+            sales_by_category=self.get_sales_by_category(),
+            sales_by_region=self.get_sales_by_region(),
+            sales_by_sales_person=self.get_sales_by_sales_person(),
+            sales_by_product=self._get_sales_by_product(),
+            quantity_by_category=self.get_quantity_by_category(),
+            average_unit_price_by_category=self.get_average_unit_price_by_category(),
+            transaction_count_by_region=self.get_transaction_count_by_region(),
+            unique_products=self.get_unique_products(),
+            top_region=self.get_top_region(),
+            top_sales_person=self.get_top_sales_person(),
+        )
 
 
 def main():
@@ -189,102 +429,112 @@ def main():
     script_dir = os.path.dirname(os.path.abspath(__file__))
     # Construct path to CSV file relative to script location
     csv_file_path = os.path.join(script_dir, "..", "data", "sales_data.csv")
+    # The report is assembled in memory and written to stdout in one call
+    out = io.StringIO()
     
     try:
         # Read sales data from CSV
         sales_records = read_sales_data(csv_file_path)
-        print("=" * 80)
-        print("SALES DATA ANALYSIS - PYTHON FUNCTIONAL PROGRAMMING")
-        print("=" * 80)
-        print(f"\nTotal Records Loaded: {len(sales_records)}")
-        print("\n" + "=" * 80)
+        print("=" * 80, file=out)
+        print("SALES DATA ANALYSIS - PYTHON FUNCTIONAL PROGRAMMING", file=out)
+        print("=" * 80, file=out)
+        print(f"\nTotal Records Loaded: {len(sales_records)}", file=out)
+        print("\n" + "=" * 80, file=out)
         
-        # Create analyzer instance
+        # Create analyzer instance and compute every aggregate in one pass
         analyzer = SalesAnalyzer(sales_records)
+        report = analyzer.compute_all()
         
         # Perform various analyses
-        print("\n1. BASIC STATISTICS")
-        print("-" * 80)
-        print(f"Total Sales Amount: ${analyzer.get_total_sales():.2f}")
-        print(f"Average Sales Amount: ${analyzer.get_average_sales():.2f}")
-        print(f"Maximum Sales Amount: ${analyzer.get_max_sales():.2f}")
-        print(f"Minimum Sales Amount: ${analyzer.get_min_sales():.2f}")
-        print(f"Total Quantity Sold: {analyzer.get_total_quantity()} units")
+        print("\n1. BASIC STATISTICS", file=out)
+        print("-" * 80, file=out)
+        print(f"Total Sales Amount: ${report.total_sales:.2f}", file=out)
+        print(f"Average Sales Amount: ${report.average_sales:.2f}", file=out)
+        print(f"Maximum Sales Amount: ${report.max_sales:.2f}", file=out)
+        print(f"Minimum Sales Amount: ${report.min_sales:.2f}", file=out)
+        print(f"Total Quantity Sold: {report.total_quantity} units", file=out)
         
-        print("\n2. SALES BY CATEGORY")
-        print("-" * 80)
-        sales_by_category = analyzer.get_sales_by_category()
-        for category, sales in sorted(sales_by_category.items(), key=lambda x: x[1], reverse=True):
-            print(f"  {category:<20}: ${sales:.2f}")
+        print("\n2. SALES BY CATEGORY", file=out)
+        print("-" * 80, file=out)
+        sales_by_category = report.sales_by_category
+        for category, sales in sorted(sales_by_category.items(), key=itemgetter(1), reverse=True):
+            print(f"  {category:<20}: ${sales:.2f}", file=out)
         
-        print("\n3. SALES BY REGION")
-        print("-" * 80)
-        sales_by_region = analyzer.get_sales_by_region()
-        for region, sales in sorted(sales_by_region.items(), key=lambda x: x[1], reverse=True):
-            print(f"  {region:<20}: ${sales:.2f}")
+        print("\n3. SALES BY REGION", file=out)
+        print("-" * 80, file=out)
+        sales_by_region = report.sales_by_region
+        for region, sales in sorted(sales_by_region.items(), key=itemgetter(1), reverse=True):
+            print(f"  {region:<20}: ${sales:.2f}", file=out)
         
-        print("\n4. SALES BY SALES PERSON")
-        print("-" * 80)
-        sales_by_sales_person = analyzer.get_sales_by_sales_person()
-        for person, sales in sorted(sales_by_sales_person.items(), key=lambda x: x[1], reverse=True):
-            print(f"  {person:<20}: ${sales:.2f}")
+        print("\n4. SALES BY SALES PERSON", file=out)
+        print("-" * 80, file=out)
+        sales_by_sales_person = report.sales_by_sales_person
+        for person, sales in sorted(sales_by_sales_person.items(), key=itemgetter(1), reverse=True):
+            print(f"  {person:<20}: ${sales:.2f}", file=out)
         
-        print("\n5. TOP 5 PRODUCTS BY SALES")
-        print("-" * 80)
+        print("\n5. TOP 5 PRODUCTS BY SALES", file=out)
+        print("-" * 80, file=out)
         top_products = analyzer.get_top_products(5)
         for product, sales in top_products.items():
-            print(f"  {product:<20}: ${sales:.2f}")
+            print(f"  {product:<20}: ${sales:.2f}", file=out)
         
-        print("\n6. QUANTITY SOLD BY CATEGORY")
-        print("-" * 80)
-        quantity_by_category = analyzer.get_quantity_by_category()
-        for category, quantity in sorted(quantity_by_category.items(), key=lambda x: x[1], reverse=True):
-            print(f"  {category:<20}: {quantity} units")
+        print("\n6. QUANTITY SOLD BY CATEGORY", file=out)
+        print("-" * 80, file=out)
+        quantity_by_category = report.quantity_by_category
+        for category, quantity in sorted(quantity_by_category.items(), key=itemgetter(1), reverse=True):
+            print(f"  {category:<20}: {quantity} units", file=out)
         
-        print("\n7. AVERAGE UNIT PRICE BY CATEGORY")
-        print("-" * 80)
-        avg_price_by_category = analyzer.get_average_unit_price_by_category()
-        for category, avg_price in sorted(avg_price_by_category.items(), key=lambda x: x[1], reverse=True):
-            print(f"  {category:<20}: ${avg_price:.2f}")
+        print("\n7. AVERAGE UNIT PRICE BY CATEGORY", file=out)
+        print("-" * 80, file=out)
+        avg_price_by_category = report.average_unit_price_by_category
+        for category, avg_price in sorted(avg_price_by_category.items(), key=itemgetter(1), reverse=True):
+            print(f"  {category:<20}: ${avg_price:.2f}", file=out)
         
-        print("\n8. TRANSACTION COUNT BY REGION")
-        print("-" * 80)
-        transaction_count = analyzer.get_transaction_count_by_region()
-        for region, count in sorted(transaction_count.items(), key=lambda x: x[1], reverse=True):
-            print(f"  {region:<20}: {count} transactions")
+        print("\n8. TRANSACTION COUNT BY REGION", file=out)
+        print("-" * 80, file=out)
+        transaction_count = report.transaction_count_by_region
+        for region, count in sorted(transaction_count.items(), key=itemgetter(1), reverse=True):
+            print(f"  {region:<20}: {count} transactions", file=out)
         
-        print("\n9. TOP PERFORMERS")
-        print("-" * 80)
-        top_region = analyzer.get_top_region()
+        print("\n9. TOP PERFORMERS", file=out)
+        print("-" * 80, file=out)
+        top_region = report.top_region
         if top_region:
-            print(f"  Top Region: {top_region}")
+            print(f"  Top Region: {top_region}", file=out)
         
-        top_sales_person = analyzer.get_top_sales_person()
+        top_sales_person = report.top_sales_person
         if top_sales_person:
-            print(f"  Top Sales Person: {top_sales_person}")
+            print(f"  Top Sales Person: {top_sales_person}", file=out)
         
-        print("\n10. UNIQUE PRODUCTS")
-        print("-" * 80)
-        unique_products = analyzer.get_unique_products()
-        print(f"  Total Unique Products: {len(unique_products)}")
+        print("\n10. UNIQUE PRODUCTS", file=out)
+        print("-" * 80, file=out)
+        unique_products = report.unique_products
+        print(f"  Total Unique Products: {len(unique_products)}", file=out)
         for product in sorted(unique_products):
-            print(f"    - {product}")
+            print(f"    - {product}", file=out)
         
-        print("\n11. FILTERED ANALYSIS - ELECTRONICS CATEGORY")
-        print("-" * 80)
+        print("\n11. FILTERED ANALYSIS - ELECTRONICS CATEGORY", file=out)
+        print("-" * 80, file=out)
         electronics_sales = analyzer.get_sales_by_category_filtered("Electronics")
-        print(f"  Total Electronics Sales: ${electronics_sales:.2f}")
+        print(f"  Total Electronics Sales: ${electronics_sales:.2f}", file=out)
         
-        print("\n" + "=" * 80)
-        print("ANALYSIS COMPLETE")
-        print("=" * 80)
+        print("\n" + "=" * 80, file=out)
+        print("ANALYSIS COMPLETE", file=out)
+        print("=" * 80, file=out)
         
     except FileNotFoundError:
-        print(f"Error: CSV file not found at {csv_file_path}")
+        print(f"Error: CSV file not found at {csv_file_path}", file=out)
     except Exception as e:
-        print(f"Error: {e}")
+        print(f"Error: {e}", file=out)
+        # Emit the partial report before the traceback, which goes straight to stderr
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
+        out.seek(0)
+        out.truncate()
         import traceback
         traceback.print_exc()
+    finally:
+        sys.stdout.write(out.getvalue())
 
 
 if __name__ == "__main__":
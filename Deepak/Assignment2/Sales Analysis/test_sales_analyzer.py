@@ -2,24 +2,43 @@
 Unit tests for SalesAnalyzer class.
 """
 
+import os
+import tempfile
 import unittest
 from datetime import date
-from sales_analyzer import SalesRecord, SalesAnalyzer
+from sales_analyzer import SalesRecord, SalesAnalyzer, read_sales_data
 
 
 class TestSalesAnalyzer(unittest.TestCase):
     """Test cases for SalesAnalyzer class."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.test_records = [
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by all tests (the analyzer does not mutate them)."""
+        cls.test_records = [
             SalesRecord("2024-01-15", "Laptop", "Electronics", 5, 1200.00, 6000.00, "North", "John Smith"),
             SalesRecord("2024-01-16", "Desk Chair", "Furniture", 10, 250.00, 2500.00, "South", "Mary Johnson"),
             SalesRecord("2024-01-17", "Wireless Mouse", "Electronics", 25, 35.00, 875.00, "East", "John Smith"),
             SalesRecord("2024-01-18", "Office Desk", "Furniture", 8, 450.00, 3600.00, "West", "Robert Brown"),
             SalesRecord("2024-01-19", "Monitor", "Electronics", 12, 300.00, 3600.00, "North", "Mary Johnson"),
         ]
-        self.analyzer = SalesAnalyzer(self.test_records)
+        cls.analyzer = SalesAnalyzer(cls.test_records)
+    
+    def test_sales_record_fields(self):
+        """Test that SalesRecord parses the date and uses a fixed attribute layout."""
+        record = self.test_records[0]
+        self.assertEqual(date(2024, 1, 15), record.date)
+        self.assertEqual("Laptop", record.product)
+        self.assertAlmostEqual(6000.00, record.total_amount, places=2)
+        self.assertFalse(hasattr(record, "__dict__"))
+    
+    def test_sales_record_date_formats(self):
+        """Test that SalesRecord accepts exactly the dates strptime("%Y-%m-%d") accepts."""
+        record = SalesRecord("2024-1-5", "Laptop", "Electronics", 1, 10.00, 10.00, "North", "John Smith")
+        self.assertEqual(date(2024, 1, 5), record.date)
+        for text in ("20240115", "2024-13-01", "2024-01-15T10:00"):
+            with self.assertRaises(ValueError):
+                SalesRecord(text, "Laptop", "Electronics", 1, 10.00, 10.00, "North", "John Smith")
     
     def test_get_total_sales(self):
         """Test total sales calculation."""
@@ -82,6 +101,14 @@ class TestSalesAnalyzer(unittest.TestCase):
         self.assertGreaterEqual(values[0], values[1])
         self.assertGreaterEqual(values[1], values[2])
     
+    def test_get_top_products_more_than_available(self):
+        """Test top products when N exceeds the number of products."""
+        top_products = self.analyzer.get_top_products(10)
+        
+        self.assertEqual(5, len(top_products))
+        self.assertEqual("Laptop", next(iter(top_products)))
+        self.assertAlmostEqual(6000.00, top_products["Laptop"], places=2)
+    
     def test_get_quantity_by_category(self):
         """Test quantity grouping by category."""
         quantity_by_category = self.analyzer.get_quantity_by_category()
@@ -130,6 +157,12 @@ class TestSalesAnalyzer(unittest.TestCase):
         furniture_sales = self.analyzer.get_sales_by_category_filtered("Furniture")
         self.assertAlmostEqual(2500.00 + 3600.00, furniture_sales, places=2)
     
+    def test_get_sales_by_category_filtered_case_and_missing(self):
+        """Test filtered sales ignores case and returns 0 for unknown categories."""
+        self.assertAlmostEqual(2500.00 + 3600.00,
+                              self.analyzer.get_sales_by_category_filtered("furniture"), places=2)
+        self.assertEqual(0.0, self.analyzer.get_sales_by_category_filtered("Toys"))
+    
     def test_get_unique_products(self):
         """Test unique products retrieval."""
         unique_products = self.analyzer.get_unique_products()
@@ -145,6 +178,73 @@ class TestSalesAnalyzer(unittest.TestCase):
         total_quantity = self.analyzer.get_total_quantity()
         self.assertEqual(5 + 10 + 25 + 8 + 12, total_quantity)
     
+    def test_compute_all(self):
+        """Test that the fused pass matches the individual aggregations."""
+        report = SalesAnalyzer(self.test_records).compute_all()
+        
+        self.assertAlmostEqual(self.analyzer.get_total_sales(), report.total_sales, places=2)
+        self.assertEqual(self.analyzer.get_total_quantity(), report.total_quantity)
+        self.assertEqual(self.analyzer.get_sales_by_category(), report.sales_by_category)
+        self.assertEqual(self.analyzer.get_sales_by_region(), report.sales_by_region)
+        self.assertEqual(self.analyzer.get_sales_by_sales_person(), report.sales_by_sales_person)
+        self.assertEqual(self.analyzer.get_quantity_by_category(), report.quantity_by_category)
+        self.assertEqual(self.analyzer.get_average_unit_price_by_category(),
+                         report.average_unit_price_by_category)
+        self.assertEqual(self.analyzer.get_transaction_count_by_region(),
+                         report.transaction_count_by_region)
+        self.assertEqual(self.analyzer.get_unique_products(), report.unique_products)
+        self.assertEqual("North", report.top_region)
+        self.assertEqual("John Smith", report.top_sales_person)
+        self.assertAlmostEqual(6000.00, report.sales_by_product["Laptop"], places=2)
+    
+    def test_cached_results_are_not_shared(self):
+        """Test that mutating a returned aggregate does not affect later calls."""
+        sales_by_region = self.analyzer.get_sales_by_region()
+        sales_by_region["North"] = 0.0
+        self.assertAlmostEqual(6000.00 + 3600.00,
+                              self.analyzer.get_sales_by_region()["North"], places=2)
+        self.assertEqual("North", self.analyzer.get_top_region())
+    
+    def test_invalidate(self):
+        """Test that invalidate picks up changes to the records."""
+        records = list(self.test_records)
+        analyzer = SalesAnalyzer(records)
+        self.assertEqual(2, len(analyzer.get_sales_by_category()))
+        records.append(
+            SalesRecord("2024-01-20", "Stapler", "Office", 3, 10.00, 30.00, "South", "Mary Johnson"))
+        analyzer.invalidate()
+        self.assertEqual(3, len(analyzer.get_sales_by_category()))
+        self.assertAlmostEqual(30.00, analyzer.get_sales_by_category()["Office"], places=2)
+    
+    def test_read_sales_data(self):
+        """Test that read_sales_data maps columns by header name."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "sales.csv")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("Product,Date,Category,Quantity,UnitPrice,TotalAmount,Region,SalesPerson\n"
+                           "Laptop,2024-01-15,Electronics,5,1200.00,6000.00,North,John Smith\n"
+                           "\n")
+            records = read_sales_data(path)
+        self.assertEqual(1, len(records))
+        record = records[0]
+        self.assertEqual(date(2024, 1, 15), record.date)
+        self.assertEqual("Laptop", record.product)
+        self.assertEqual(5, record.quantity)
+        self.assertAlmostEqual(6000.00, record.total_amount, places=2)
+        self.assertEqual("John Smith", record.sales_person)
+    
+    def test_non_integer_quantity(self):
+        """Test that fractional quantities are summed rather than rejected."""
+        records = [
+            SalesRecord("2024-01-15", "Cable", "Electronics", 1.5, 4.00, 6.00, "North", "John Smith"),
+            SalesRecord("2024-01-16", "Cable", "Electronics", 2, 4.00, 8.00, "South", "Mary Johnson"),
+        ]
+        analyzer = SalesAnalyzer(records)
+        self.assertAlmostEqual(3.5, analyzer.get_total_quantity(), places=2)
+        self.assertAlmostEqual(3.5, analyzer.get_quantity_by_category()["Electronics"], places=2)
+        self.assertAlmostEqual(3.5, analyzer.compute_all().total_quantity, places=2)
+        self.assertAlmostEqual(14.00, analyzer.get_total_sales(), places=2)
+    
     def test_empty_list(self):
         """Test analyzer with empty list."""
         empty_analyzer = SalesAnalyzer([])